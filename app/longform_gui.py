@@ -3,15 +3,23 @@
 import json, os, re, tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from tkinter.scrolledtext import ScrolledText
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Dict, Any
-from PIL import Image, ImageTk
-import numpy as np
 
 # ---------------------------------------------------------
 # 📸 썸네일 이미지 분석 함수
 # ---------------------------------------------------------
+# PIL/NumPy 는 첫 분석 때 불러옴 (GUI 첫 화면을 빨리 띄우기 위해)
+_LUMA_W = (0.2126, 0.7152, 0.0722)  # BT.709
+
+def _preload_image_libs():
+    # 창이 뜬 뒤 작업 스레드에서 미리 불러와 첫 분석의 import 지연을 없앰
+    import numpy, PIL.Image
+
 def _to_rgb(img):
+    from PIL import Image
     if img.mode in ("RGBA", "LA"):
         bg = Image.new("RGBA", img.size, (255, 255, 255, 255))
         bg.paste(img, mask=img.split()[-1])
@@ -20,49 +28,91 @@ def _to_rgb(img):
         img = img.convert("RGB")
     return img
 
+def _skin_ratio(arr):
+    # 피부톤 비율: 명도·채도 조건으로 먼저 거르고, 후보 픽셀만 색상(H)을 계산
+    # (colorsys.rgb_to_hsv 기준 H∈[0,0.14]∪[0.9,1), S∈[0.1,0.7], V∈[0.2,0.95])
+    # 일반 썸네일은 후보가 소수라 전체 평면 H 계산보다 약 2배 빠름 (화면 대부분이 피부색이면 더 느림)
+    import numpy as np
+    # 채널 축(길이 3) max/min 축소는 느려서 채널 평면끼리 np.maximum/np.minimum 으로 계산
+    r, g, b = arr[..., 0], arr[..., 1], arr[..., 2]
+    maxc = np.maximum(np.maximum(r, g), b)
+    delta = maxc - np.minimum(np.minimum(r, g), b)
+    s = delta / np.where(maxc == 0, np.float32(1), maxc)
+    cand = (s >= 0.1) & (s <= 0.7) & (maxc >= 0.2) & (maxc <= 0.95)
+    if not cand.any():
+        return 0.0
+    r, g, b = r[cand], g[cand], b[cand]
+    m = maxc[cand]
+    d = delta[cand]
+    rc = (m - r) / d
+    gc = (m - g) / d
+    bc = (m - b) / d
+    h = np.where(r == m, bc - gc, np.where(g == m, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = (h / 6.0) % 1.0
+    return float(np.count_nonzero((h <= 0.14) | (h >= 0.9)) / maxc.size)
+
+def _luma_stats(luma):
+    # 대비(표준편차)·흰색/검정 비율을 luma 가 캐시에 있을 때 한 번에 계산
+    import numpy as np
+    flat = luma.ravel()
+    n = flat.size
+    mean = flat.mean(dtype=np.float64)
+    d = flat - np.float32(mean)
+    contrast_std = float(np.sqrt(np.dot(d, d) / n) * 100.0)
+    white_ratio = float(np.count_nonzero(flat > 0.85) / n)
+    black_ratio = float(np.count_nonzero(flat < 0.15) / n)
+    return contrast_std, white_ratio, black_ratio
+
+def _smooth3(a, axis):
+    # [1,2,1] 평활, 가장자리는 복제(np.pad mode="edge" 와 동일)하되 패딩 배열은 만들지 않음
+    a = a.swapaxes(0, axis)
+    out = 2 * a
+    out[1:] += a[:-1]
+    out[:-1] += a[1:]
+    out[0] += a[0]
+    out[-1] += a[-1]
+    return out.swapaxes(0, axis)
+
+def _diff3(a, axis):
+    # [1,0,-1] 차분, 가장자리 복제
+    import numpy as np
+    a = a.swapaxes(0, axis)
+    n = a.shape[0]
+    out = np.empty_like(a)
+    out[1:-1] = a[:-2] - a[2:]
+    out[0] = a[0] - a[min(1, n - 1)]
+    out[-1] = a[max(n - 2, 0)] - a[-1]
+    return out.swapaxes(0, axis)
+
 def analyze_thumbnail_image(pil_image):
+    from PIL import Image
+    import numpy as np
     img = _to_rgb(pil_image)
+    # 점수 기준값(대비·엣지·흰색/검정 비율)은 긴 변 512px·BICUBIC 축소 기준으로 맞춰져 있음
     base = 512
     w, h = img.size
     scale = base / max(w, h)
     if scale < 1.0:
-        img = img.resize((int(w * scale), int(h * scale)), Image.BICUBIC)
+        size = (max(1, int(w * scale)), max(1, int(h * scale)))
+        img = img.resize(size, Image.BICUBIC)
     arr = np.asarray(img).astype(np.float32) / 255.0
-    luma = 0.2126 * arr[:, :, 0] + 0.7152 * arr[:, :, 1] + 0.0722 * arr[:, :, 2]
-    contrast_std = float(np.std(luma) * 100.0)
-
-    # 간단한 엣지 계산 (Sobel)
-    Kx = np.array([[1, 0, -1], [2, 0, -2], [1, 0, -1]], dtype=np.float32)
-    Ky = np.array([[1, 2, 1], [0, 0, 0], [-1, -2, -1]], dtype=np.float32)
-    gp = np.pad(luma, ((1, 1), (1, 1)), mode="edge")
-    Gx = (
-        Kx[0, 0] * gp[:-2, :-2] + Kx[0, 1] * gp[:-2, 1:-1] + Kx[0, 2] * gp[:-2, 2:] +
-        Kx[1, 0] * gp[1:-1, :-2] + Kx[1, 1] * gp[1:-1, 1:-1] + Kx[1, 2] * gp[1:-1, 2:] +
-        Kx[2, 0] * gp[2:, :-2] + Kx[2, 1] * gp[2:, 1:-1] + Kx[2, 2] * gp[2:, 2:]
-    )
-    Gy = (
-        Ky[0, 0] * gp[:-2, :-2] + Ky[0, 1] * gp[:-2, 1:-1] + Ky[0, 2] * gp[:-2, 2:] +
-        Ky[1, 0] * gp[1:-1, :-2] + Ky[1, 1] * gp[1:-1, 1:-1] + Ky[1, 2] * gp[1:-1, 2:] +
-        Ky[2, 0] * gp[2:, :-2] + Ky[2, 1] * gp[2:, 1:-1] + Ky[2, 2] * gp[2:, 2:]
-    )
-    grad = np.sqrt(Gx ** 2 + Gy ** 2)
+    luma = (arr.reshape(-1, 3) @ np.array(_LUMA_W, dtype=np.float32)).reshape(arr.shape[:2])
+    contrast_std, white_ratio, black_ratio = _luma_stats(luma)
+
+    # 간단한 엣지 계산 (Sobel, 분리형: [1,2,1] 평활 × [1,0,-1] 차분)
+    Gx = _diff3(_smooth3(luma, 0), 1)
+    Gy = _diff3(_smooth3(luma, 1), 0)
+    grad = np.hypot(Gx, Gy)
     thresh = max(0.2, float(np.mean(grad) + 1.5 * np.std(grad)))
     edge_density = float((grad > thresh).mean())
 
-    white_ratio = float((luma > 0.85).mean())
-    black_ratio = float((luma < 0.15).mean())
-
     mean_rgb = np.mean(arr.reshape(-1, 3), axis=0)
     red_dom = mean_rgb[0] > 0.4 and mean_rgb[0] > mean_rgb[1] + 0.05 and mean_rgb[0] > mean_rgb[2] + 0.05
     yellow_dom = (mean_rgb[0] > 0.45 and mean_rgb[1] > 0.45 and mean_rgb[2] < 0.3)
     blue_dom = mean_rgb[2] > 0.4 and mean_rgb[2] > mean_rgb[1] + 0.05 and mean_rgb[2] > mean_rgb[0] + 0.05
     color_pop = any([red_dom, yellow_dom, blue_dom])
 
-    import colorsys
-    hsv = np.array([colorsys.rgb_to_hsv(*px) for px in arr.reshape(-1, 3)], dtype=np.float32)
-    H, S, V = hsv[:, 0], hsv[:, 1], hsv[:, 2]
-    skin_mask = (((H >= 0.0) & (H <= 0.14)) | (H >= 0.9)) & (S >= 0.1) & (S <= 0.7) & (V >= 0.2) & (V <= 0.95)
-    skin_ratio = float(skin_mask.mean())
+    skin_ratio = _skin_ratio(arr)
 
     cues = {
         "face_closeup_proxy": skin_ratio >= 0.12,
@@ -85,9 +135,18 @@ def analyze_thumbnail_image(pil_image):
         "salience_score_0_5": score
     }
 
+@lru_cache(maxsize=32)
+def _cached_thumbnail_analysis(path, mtime_ns, size):
+    # 경로·수정시각·크기가 같으면 이전 분석 결과를 재사용
+    from PIL import Image
+    with Image.open(path) as img:
+        return analyze_thumbnail_image(img)
+
 # ---------------------------------------------------------
 # 🧠 텍스트/스크립트 분석 유틸
 # ---------------------------------------------------------
+_RE_WORD = re.compile(r"[가-힣A-Za-z0-9]+")
+
 @dataclass
 class ReferenceVideoInput:
     views: int
@@ -101,15 +160,15 @@ def safe_div(a, b):
     return a / b if b else 0
 
 def analyze_reference(ref: ReferenceVideoInput):
-    title_keywords = [w for w in re.findall(r"[가-힣A-Za-z0-9]+", ref.title) if len(w) > 1]
+    title_keywords = [w for w in _RE_WORD.findall(ref.title) if len(w) > 1]
     er = safe_div(ref.likes, ref.views)
     er_tier = "높음(5%+)" if er >= 0.05 else "보통(1~4%)" if er >= 0.01 else "낮음(<1%)"
 
     thumb_result = {}
     if os.path.isfile(ref.thumbnail):
         try:
-            img = Image.open(ref.thumbnail)
-            thumb_result = analyze_thumbnail_image(img)
+            st = os.stat(ref.thumbnail)
+            thumb_result = _cached_thumbnail_analysis(ref.thumbnail, st.st_mtime_ns, st.st_size)
         except Exception as e:
             thumb_result = {"error": str(e)}
 
@@ -128,7 +187,11 @@ class App(tk.Tk):
         super().__init__()
         self.title("Longform Script Builder (KR) - 썸네일 이미지 분석")
         self.geometry("1100x750")
+        # 분석은 작업 스레드에서 돌려 UI가 멈추지 않도록 함 (NumPy 연산은 GIL 해제)
+        self.pool = ThreadPoolExecutor(max_workers=1)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         self.build_ui()
+        self.after(100, self.pool.submit, _preload_image_libs)
 
     def build_ui(self):
         nb = ttk.Notebook(self)
@@ -168,7 +231,8 @@ class App(tk.Tk):
         frame.grid_rowconfigure(3, weight=1)
         frame.grid_columnconfigure(1, weight=1)
 
-        ttk.Button(frame, text="분석 실행", command=self.run_analysis).grid(row=4, column=5, pady=10)
+        self.btn_run = ttk.Button(frame, text="분석 실행", command=self.run_analysis)
+        self.btn_run.grid(row=4, column=5, pady=10)
 
         # 결과 탭
         self.txt_out = ScrolledText(self.tab_output, height=30, wrap="word")
@@ -193,19 +257,43 @@ class App(tk.Tk):
             messagebox.showerror("입력 오류", "숫자 형식을 확인하세요.")
             return
 
-        result = analyze_reference(ref)
-        self.txt_out.delete("1.0", "end")
-        self.txt_out.insert("end", f"제목 키워드: {', '.join(result['title_keywords'])}\n")
-        self.txt_out.insert("end", f"참여율: {result['engagement_rate']}% ({result['er_tier']})\n")
+        self.btn_run.configure(state="disabled")
+        future = self.pool.submit(analyze_reference, ref)
+        self.after(50, self.poll_analysis, future)
 
+    def poll_analysis(self, future):
+        if not future.done():
+            self.after(50, self.poll_analysis, future)
+            return
+        self.btn_run.configure(state="normal")
+        try:
+            result = future.result()
+        except Exception as e:
+            messagebox.showerror("분석 오류", str(e))
+            return
+        self.render_result(result)
+
+    def render_result(self, result):
+        # 출력 문자열을 먼저 모은 뒤 위젯에는 한 번만 삽입
+        parts = [
+            f"제목 키워드: {', '.join(result['title_keywords'])}\n",
+            f"참여율: {result['engagement_rate']}% ({result['er_tier']})\n",
+        ]
         thumb = result["thumbnail_analysis"]
         if thumb:
-            self.txt_out.insert("end", f"\n[썸네일 분석]\n{json.dumps(thumb, ensure_ascii=False, indent=2)}\n")
+            parts.append(f"\n[썸네일 분석]\n{json.dumps(thumb, ensure_ascii=False, indent=2)}\n")
         else:
-            self.txt_out.insert("end", "\n썸네일 이미지가 없습니다.\n")
+            parts.append("\n썸네일 이미지가 없습니다.\n")
+
+        self.txt_out.delete("1.0", "end")
+        self.txt_out.insert("end", "".join(parts))
 
         messagebox.showinfo("완료", "분석이 완료되었습니다!")
 
+    def on_close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
+
 # ---------------------------------------------------------
 if __name__ == "__main__":
     App().mainloop()